@@ -1,47 +1,88 @@
 #!/usr/bin/env python3
 # /// script
 # requires-python = ">=3.12"
-# dependencies = ["playwright", "yt-dlp", "requests"]
+# dependencies = ["playwright", "yt-dlp", "requests", "aiohttp"]
 # ///
 """CLI tool to enrich a markdown note by fetching text for all X post and YouTube URLs found in it."""
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import re
+import string
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from get_yt_subtitle import fetch_subtitle_text, youtube_cookiefile_from_firefox
-from open_x import extract_x_cookies, find_firefox_profile, scrape_post
-from playwright.sync_api import sync_playwright
+import aiohttp
 
-X_URL_PATTERN = re.compile(r"https?://(?:x|twitter)\.com/\w+/status/(\d+)[^\s]*")
+from get_yt_subtitle import (
+    build_ydl,
+    download_and_strip,
+    resolve_subtitle_url,
+    youtube_cookiefile_from_firefox,
+)
+from open_x import extract_x_cookies, find_firefox_profile, scrape_post_async
+from playwright.async_api import async_playwright
+
+# re.ASCII keeps \w/\d/\s in their fast ASCII-only forms; URLs are ASCII anyway.
+X_URL_PATTERN = re.compile(
+    r"https?://(?:x|twitter)\.com/\w+/status/(?P<post_id>\d+)[^\s]*", re.ASCII
+)
 YT_URL_PATTERN = re.compile(
-    r"https?://(?:www\.)?(?:youtube\.com/watch\?(?:[^\s#]*&)?v=([A-Za-z0-9_-]{11})|youtu\.be/([A-Za-z0-9_-]{11}))[^\s]*"
+    r"https?://(?:www\.)?(?:youtube\.com/watch\?(?:[^\s#]*&)?v=(?P<video_id>[A-Za-z0-9_-]{11})|youtu\.be/(?P<short_id>[A-Za-z0-9_-]{11}))[^\s]*",
+    re.ASCII,
+)
+PW_PROFILE_DIR = Path.home() / ".cache" / "enrich_note" / "pw-profile"
+
+# Both patterns fused so extract_urls scans the note content only once.
+# Flags don't travel with the pattern strings, so re.ASCII is repeated here.
+_COMBINED_URL_PATTERN = re.compile(
+    rf"(?P<yt>{YT_URL_PATTERN.pattern})|(?P<x>{X_URL_PATTERN.pattern})", re.ASCII
 )
 
 
 def extract_urls(
     md_path: Path,
 ) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
-    """Return (yt_pairs, x_pairs) where each entry is (url, unique_id)."""
+    """Return (yt_pairs, x_pairs) where each entry is (url, unique_id).
+
+    Duplicate references to the same video/post are collapsed (first URL wins)
+    so each item is only fetched once per run.
+    """
     content = md_path.read_text(encoding="utf-8")
-    yt_pairs = [
-        (m.group(0), m.group(1) or m.group(2))
-        for m in YT_URL_PATTERN.finditer(content)
-    ]
-    x_pairs = [(m.group(0), m.group(1)) for m in X_URL_PATTERN.finditer(content)]
+    yt_by_id: dict[str, str] = {}
+    x_by_id: dict[str, str] = {}
+    for m in _COMBINED_URL_PATTERN.finditer(content):
+        if m.group("yt"):
+            yt_by_id.setdefault(m.group("video_id") or m.group("short_id"), m.group(0))
+        else:
+            x_by_id.setdefault(m.group("post_id"), m.group(0))
+    yt_pairs = [(url, video_id) for video_id, url in yt_by_id.items()]
+    x_pairs = [(url, post_id) for post_id, url in x_by_id.items()]
     return yt_pairs, x_pairs
 
 
+class _SlugTable(dict[int, str]):
+    """Translate table keeping [a-z0-9] and mapping everything else to '-'."""
+
+    def __missing__(self, key: int) -> str:
+        return "-"
+
+
+_SLUG_TABLE = _SlugTable({ord(c): c for c in string.ascii_lowercase + string.digits})
+_DASH_RUN_RE = re.compile(r"-+")
+
+
 def slugify(value: str) -> str:
     """Convert a title to a filesystem-friendly slug."""
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", value.strip().lower()).strip("-")
+    slug = _DASH_RUN_RE.sub("-", value.lower().translate(_SLUG_TABLE)).strip("-")
     return slug or "untitled"
 
 
@@ -50,13 +91,50 @@ class _TemplateDict(dict[str, Any]):
         return ""
 
 
+def _single_field_template(template: str) -> tuple[str, str, str] | None:
+    """Return (prefix, field, suffix) when the template interpolates exactly
+    one bare placeholder, enabling a concat fast path; None otherwise."""
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError:
+        return None
+    if not parsed or len(parsed) > 2:
+        return None
+    prefix, name, spec, conversion = parsed[0]
+    if name is None or spec or conversion:
+        return None
+    suffix = ""
+    if len(parsed) == 2:
+        suffix, tail_name, _, _ = parsed[1]
+        if tail_name is not None:
+            return None
+    return prefix, name, suffix
+
+
 @dataclass
 class OutputConfig:
     base_dir: Path
     yt_template: str
     x_template: str
 
+    def __post_init__(self) -> None:
+        # The default templates only reference a single placeholder; resolve
+        # those with plain concatenation instead of a dict + format_map.
+        self._yt_fast = _single_field_template(self.yt_template)
+        self._x_fast = _single_field_template(self.x_template)
+
     def youtube_path(self, *, video_id: str, title: str) -> Path:
+        if self._yt_fast is not None:
+            prefix, field, suffix = self._yt_fast
+            if field == "video_id":
+                value = video_id
+            elif field == "title":
+                value = title
+            elif field == "title_slug":
+                value = slugify(title) if title else video_id
+            else:
+                value = ""
+            return self.base_dir / f"{prefix}{value}{suffix}"
         ctx = _TemplateDict(
             video_id=video_id,
             title=title,
@@ -65,10 +143,65 @@ class OutputConfig:
         return self.base_dir / self.yt_template.format_map(ctx)
 
     def x_path(self, *, post_id: str) -> Path:
+        if self._x_fast is not None:
+            prefix, field, suffix = self._x_fast
+            value = post_id if field == "post_id" else ""
+            return self.base_dir / f"{prefix}{value}{suffix}"
         ctx = _TemplateDict(post_id=post_id)
         return self.base_dir / self.x_template.format_map(ctx)
 
 
+async def scrape_x_posts(
+    x_pairs: list[tuple[str, str]],
+    config: OutputConfig,
+    report: dict[str, list[dict[str, Any]]],
+    cookies: list[dict[str, Any]],
+    max_pages: int = 4,
+) -> None:
+    """Scrape X posts concurrently over a pool of pages in one browser context."""
+    semaphore = asyncio.Semaphore(max_pages)
+
+    async def block_heavy_resources(route: Any) -> None:
+        if route.request.resource_type in {"image", "media", "font", "stylesheet"}:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async with async_playwright() as p:
+        # Persistent scratch profile: cheaper launch than a fresh context and
+        # the browser's HTTP cache and cookies survive across runs.
+        context = await p.firefox.launch_persistent_context(
+            str(PW_PROFILE_DIR), headless=True
+        )
+        await context.add_cookies(cookies)
+        # The tweet text DOM appears without images/media/fonts; blocking them
+        # cuts bytes transferred and gets the selector ready much sooner.
+        await context.route("**/*", block_heavy_resources)
+
+        async def scrape_one(entry: dict[str, Any], url: str, post_id: str) -> None:
+            async with semaphore:
+                page = await context.new_page()
+                try:
+                    text = await scrape_post_async(page, url)
+                finally:
+                    await page.close()
+            out_file = config.x_path(post_id=post_id)
+            ensure_parent(out_file)
+            out_file.write_bytes(f"{url}\n\n{text}".encode("utf-8"))
+            entry["status"] = "ok"
+            entry["output_path"] = str(out_file)
+            print(f"--- {url}\n    saved → {out_file}")
+
+        tasks = []
+        for url, post_id in x_pairs:
+            entry: dict[str, Any] = {"url": url, "post_id": post_id}
+            report["x"].append(entry)
+            tasks.append(scrape_one(entry, url, post_id))
+        await asyncio.gather(*tasks)
+
+        await context.close()
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Fetch YouTube subtitles and/or X posts referenced inside a markdown note.",
@@ -93,6 +226,11 @@ def parse_args() -> argparse.Namespace:
         default="x-{post_id}.md",
         help="Filename template for X outputs. Supported placeholder: {post_id}.",
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-scrape X posts even if their output file already exists.",
+    )
     parser.add_argument(
         "--json-report",
         action="store_true",
@@ -119,8 +257,79 @@ def resolve_output_dir(note_path: Path, raw_dir: str | None) -> Path:
     return (note_path.parent / "staging").resolve()
 
 
+_created_dirs: set[Path] = set()
+
+
 def ensure_parent(path: Path) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+    # Many outputs share a parent; skip the mkdir syscall after the first.
+    parent = path.parent
+    if parent not in _created_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(parent)
+
+
+async def fetch_youtube_subtitles(
+    yt_pairs: list[tuple[str, str]],
+    config: OutputConfig,
+    report: dict[str, list[dict[str, Any]]],
+    cookiefile: Path | None,
+) -> None:
+    """Resolve subtitle URLs in worker threads, then download them all concurrently."""
+    loop = asyncio.get_running_loop()
+    # YoutubeDL is not thread-safe, so instead of one shared instance each
+    # worker thread lazily builds its own and reuses it across its share of
+    # the videos, still amortizing setup without racing on instance state.
+    thread_state = threading.local()
+    ydl_instances: list[Any] = []
+
+    def resolve_in_thread(url: str) -> tuple[str, str]:
+        ydl = getattr(thread_state, "ydl", None)
+        if ydl is None:
+            ydl = thread_state.ydl = build_ydl(lang="en", cookiefile=cookiefile)
+            ydl_instances.append(ydl)
+        return resolve_subtitle_url(url, "en", cookiefile, ydl)
+
+    try:
+        with ThreadPoolExecutor() as pool:
+            resolutions = await asyncio.gather(
+                *(loop.run_in_executor(pool, resolve_in_thread, url) for url, _ in yt_pairs),
+                return_exceptions=True,
+            )
+    finally:
+        for ydl in ydl_instances:
+            ydl.close()
+
+    pending: list[tuple[dict[str, Any], str, str, str]] = []
+    downloads = []
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+        for (url, video_id), resolution in zip(yt_pairs, resolutions):
+            entry: dict[str, Any] = {"url": url, "video_id": video_id}
+            report["youtube"].append(entry)
+            print(f"--- {url}")
+            if isinstance(resolution, BaseException):
+                entry["status"] = "error"
+                entry["error"] = str(resolution)
+                print(f"    warning: could not fetch subtitles: {resolution}", file=sys.stderr)
+                continue
+            title, subtitle_url = resolution
+            pending.append((entry, url, video_id, title))
+            downloads.append(download_and_strip(session, subtitle_url))
+
+        texts = await asyncio.gather(*downloads, return_exceptions=True)
+
+    for (entry, url, video_id, title), text in zip(pending, texts):
+        if isinstance(text, BaseException):
+            entry["status"] = "error"
+            entry["error"] = str(text)
+            print(f"    warning: could not fetch subtitles: {text}", file=sys.stderr)
+            continue
+        out_file = config.youtube_path(video_id=video_id, title=title)
+        ensure_parent(out_file)
+        body = ("\n\n".join(filter(None, (f"# {title}" if title else "", url, text)))).strip() + "\n"
+        out_file.write_bytes(body.encode("utf-8"))
+        entry["status"] = "ok"
+        entry["output_path"] = str(out_file)
+        print(f"    saved → {out_file}")
 
 
 def main() -> None:
@@ -139,6 +348,7 @@ def main() -> None:
 
     output_dir = resolve_output_dir(md_path, args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    _created_dirs.add(output_dir)
     config = OutputConfig(output_dir, args.yt_template, args.x_template)
 
     report: dict[str, list[dict[str, Any]]] = {"youtube": [], "x": []}
@@ -153,54 +363,39 @@ def main() -> None:
         yt_cookie_ctx = nullcontext(None)
 
     # --- YouTube: fetch subtitles ---
-    with yt_cookie_ctx as yt_cookie_file:
-        for url, video_id in yt_pairs:
-            entry: dict[str, Any] = {"url": url, "video_id": video_id}
-            report["youtube"].append(entry)
-            print(f"--- {url}")
-            try:
-                title, text = fetch_subtitle_text(url, lang="en", cookiefile=yt_cookie_file)
-            except Exception as exc:
-                entry["status"] = "error"
-                entry["error"] = str(exc)
-                print(f"    warning: could not fetch subtitles: {exc}", file=sys.stderr)
-                continue
-            out_file = config.youtube_path(video_id=video_id, title=title)
-            ensure_parent(out_file)
-            out_file.write_text(
-                ("\n\n".join(filter(None, (f"# {title}" if title else "", url, text)))).strip() + "\n",
-                encoding="utf-8",
-            )
-            entry["status"] = "ok"
-            entry["output_path"] = str(out_file)
-            print(f"    saved → {out_file}")
+    if yt_pairs:
+        with yt_cookie_ctx as yt_cookie_file:
+            asyncio.run(fetch_youtube_subtitles(yt_pairs, config, report, yt_cookie_file))
 
     # --- X/Twitter: scrape with Playwright ---
     if x_pairs:
-        profile_path = find_firefox_profile()
-        print(f"Using Firefox profile: {profile_path}")
-        cookies = extract_x_cookies(profile_path)
-        print(f"Loaded {len(cookies)} x.com cookies\n")
-
-        with sync_playwright() as p:
-            browser = p.firefox.launch(headless=False)
-            context = browser.new_context()
-            context.add_cookies(cookies)
-            page = context.new_page()
-
-            for url, post_id in x_pairs:
-                entry = {"url": url, "post_id": post_id}
-                report["x"].append(entry)
-                print(f"--- {url}")
-                text = scrape_post(page, url)
-                out_file = config.x_path(post_id=post_id)
-                ensure_parent(out_file)
-                out_file.write_text(f"{url}\n\n{text}", encoding="utf-8")
-                entry["status"] = "ok"
-                entry["output_path"] = str(out_file)
-                print(f"    saved → {out_file}")
-
-            browser.close()
+        # Posts already fetched on a previous run are served from disk;
+        # --refresh forces a rescrape.
+        x_pending: list[tuple[str, str]] = []
+        for url, post_id in x_pairs:
+            out_file = config.x_path(post_id=post_id)
+            if not args.refresh and out_file.exists():
+                report["x"].append(
+                    {
+                        "url": url,
+                        "post_id": post_id,
+                        "status": "cached",
+                        "output_path": str(out_file),
+                    }
+                )
+                print(f"--- {url}\n    cached → {out_file}")
+            else:
+                x_pending.append((url, post_id))
+
+        # Everything below (profile lookup, cookie extraction, Playwright
+        # driver startup) only pays off if something actually needs scraping.
+        if x_pending:
+            profile_path = find_firefox_profile()
+            print(f"Using Firefox profile: {profile_path}")
+            cookies = extract_x_cookies(profile_path)
+            print(f"Loaded {len(cookies)} x.com cookies\n")
+
+            asyncio.run(scrape_x_posts(x_pending, config, report, cookies))
 
     if args.json_report:
         print(json.dumps(report, indent=2))
@@ -3,7 +3,6 @@
 
 from __future__ import annotations
 
-import glob
 import os
 import shutil
 import sqlite3
@@ -37,16 +36,24 @@ def find_firefox_profile(explicit: str | None = None) -> Path:
             raise FileNotFoundError(f"Firefox profile not found: {path}")
         return path
 
-    patterns = ("*.default-release", "*.default")
-    for pattern in patterns:
-        matches = glob.glob(str(FIREFOX_PROFILES_DIR / pattern))
-        if matches:
-            return Path(matches[0])
+    if FIREFOX_PROFILES_DIR.is_dir():
+        # One directory scan instead of a glob per pattern; prefer the
+        # .default-release variant as before.
+        entries = list(FIREFOX_PROFILES_DIR.iterdir())
+        for suffix in (".default-release", ".default"):
+            for entry in entries:
+                if entry.name.endswith(suffix):
+                    return entry
     raise FileNotFoundError(
         f"No Firefox profile found under {FIREFOX_PROFILES_DIR}. Launch Firefox once to create one."
     )
 
 
+_COOKIE_QUERY = (
+    "SELECT name, value, host, path, expiry, isSecure, isHttpOnly, sameSite FROM moz_cookies"
+)
+
+
 def _copy_cookie_db(profile_path: Path) -> Path:
     cookies_db = profile_path / "cookies.sqlite"
     if not cookies_db.exists():
@@ -57,35 +64,65 @@ def _copy_cookie_db(profile_path: Path) -> Path:
     return Path(tmp_path)
 
 
+def _select_cookies(
+    db: str | Path, query: str, params: tuple[str, ...], *, uri: bool = False
+) -> list[tuple]:
+    conn = sqlite3.connect(db, uri=uri)
+    try:
+        return conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+
 def load_firefox_cookies(
-    profile_path: Path, host_predicate: Callable[[str], bool]
+    profile_path: Path,
+    host_predicate: Callable[[str], bool] | None = None,
+    host_like: Iterable[str] | None = None,
 ) -> list[FirefoxCookie]:
-    """Return cookies from Firefox filtered by host predicate."""
-    tmp_db = _copy_cookie_db(profile_path)
-    cookies: list[FirefoxCookie] = []
+    """Return cookies from Firefox filtered by host.
+
+    ``host_like`` entries are SQL LIKE patterns ORed together so SQLite can
+    skip irrelevant rows before they cross into Python; ``host_predicate``
+    remains as a residual Python-side filter for anything LIKE can't express.
+    """
+    cookies_db = profile_path / "cookies.sqlite"
+    if not cookies_db.exists():
+        raise FileNotFoundError(f"cookies.sqlite not found in profile: {profile_path}")
+
+    query = _COOKIE_QUERY
+    params: tuple[str, ...] = ()
+    if host_like:
+        params = tuple(host_like)
+        query += " WHERE " + " OR ".join("host LIKE ?" for _ in params)
+
     try:
-        conn = sqlite3.connect(tmp_db)
-        cursor = conn.execute(
-            "SELECT name, value, host, path, expiry, isSecure, isHttpOnly, sameSite FROM moz_cookies"
-        )
-        for name, value, host, path, expiry, is_secure, is_http_only, same_site in cursor:
-            host = host or ""
-            if host_predicate(host):
-                cookies.append(
-                    FirefoxCookie(
-                        name=name or "",
-                        value=value or "",
-                        host=host,
-                        path=path or "/",
-                        expiry=int(expiry or 0),
-                        is_secure=bool(is_secure),
-                        is_http_only=bool(is_http_only),
-                        same_site=int(same_site) if same_site is not None else None,
-                    )
+        # Immutable read-only open: SQLite takes no locks and we avoid
+        # copying a potentially multi-MB database per run.
+        rows = _select_cookies(f"file:{cookies_db}?mode=ro&immutable=1", query, params, uri=True)
+    except sqlite3.OperationalError:
+        # Rare: Firefox holds an exclusive lock; fall back to a private copy.
+        tmp_db = _copy_cookie_db(profile_path)
+        try:
+            rows = _select_cookies(tmp_db, query, params)
+        finally:
+            tmp_db.unlink(missing_ok=True)
+
+    cookies: list[FirefoxCookie] = []
+    for name, value, host, path, expiry, is_secure, is_http_only, same_site in rows:
+        host = host or ""
+        if host_predicate is None or host_predicate(host):
+            cookies.append(
+                FirefoxCookie(
+                    name=name or "",
+                    value=value or "",
+                    host=host,
+                    path=path or "/",
+                    expiry=int(expiry or 0),
+                    is_secure=bool(is_secure),
+                    is_http_only=bool(is_http_only),
+                    same_site=int(same_site) if same_site is not None else None,
                 )
-        conn.close()
-    finally:
-        tmp_db.unlink(missing_ok=True)
+            )
     return cookies
 
 
@@ -94,27 +131,31 @@ def cookies_to_netscape_file(cookies: Iterable[FirefoxCookie]) -> Path:
     fd, tmp_path = tempfile.mkstemp(suffix=".cookies")
     os.close(fd)
     path = Path(tmp_path)
-    with path.open("w", encoding="utf-8") as fh:
-        fh.write("# Netscape HTTP Cookie File\n")
-        for cookie in cookies:
-            domain = cookie.host or ""
-            include_subdomains = "TRUE" if domain.startswith(".") else "FALSE"
-            secure = "TRUE" if cookie.is_secure else "FALSE"
-            expiry = str(max(int(cookie.expiry), 0))
-            prefix = "#HttpOnly_" if cookie.is_http_only else ""
-            fh.write(
-                f"{prefix}{domain}\t{include_subdomains}\t{cookie.path or '/'}\t"
-                f"{secure}\t{expiry}\t{cookie.name}\t{cookie.value}\n"
-            )
+    lines = ["# Netscape HTTP Cookie File\n"]
+    for cookie in cookies:
+        domain = cookie.host or ""
+        include_subdomains = "TRUE" if domain.startswith(".") else "FALSE"
+        secure = "TRUE" if cookie.is_secure else "FALSE"
+        expiry = str(max(int(cookie.expiry), 0))
+        prefix = "#HttpOnly_" if cookie.is_http_only else ""
+        lines.append(
+            f"{prefix}{domain}\t{include_subdomains}\t{cookie.path or '/'}\t"
+            f"{secure}\t{expiry}\t{cookie.name}\t{cookie.value}\n"
+        )
+    # Build the whole payload in memory and write it in one call rather than
+    # one fh.write per cookie.
+    path.write_text("".join(lines), encoding="utf-8")
     return path
 
 
 @contextmanager
 def firefox_cookie_jar(
-    host_predicate: Callable[[str], bool], profile_path: Path | None = None
+    host_predicate: Callable[[str], bool] | None = None,
+    profile_path: Path | None = None,
+    host_like: Iterable[str] | None = None,
 ) -> Iterator[Path]:
     profile = profile_path or find_firefox_profile()
-    cookies = load_firefox_cookies(profile, host_predicate)
+    cookies = load_firefox_cookies(profile, host_predicate, host_like)
     tmp_path = cookies_to_netscape_file(cookies)
     try:
         yield tmp_path
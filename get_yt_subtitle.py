@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # /// script
 # requires-python = ">=3.12"
-# dependencies = ["yt-dlp", "requests"]
+# dependencies = ["yt-dlp", "requests", "aiohttp"]
 # ///
 """Fetch subtitles for a YouTube video using yt-dlp."""
 
@@ -9,19 +9,37 @@ from __future__ import annotations
 
 import argparse
 import html
+import json
 import re
 import sys
+import time
 from contextlib import contextmanager, nullcontext
+from itertools import groupby
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Iterable, Iterator, Optional
 
+import aiohttp
 import requests
 import yt_dlp  # type: ignore[import]
 
 from firefox_cookies import firefox_cookie_jar, find_firefox_profile
 
 
-_TIMECODE_RE = re.compile(r"\d{2}:\d{2}:\d{2}\.\d{3}\s+-->\s+\d{2}:\d{2}:\d{2}\.\d{3}")
+# One pass removes HTML/VTT tags like <c>, <i>, <00:00:01.000> and bracketed
+# stage directions like [music]. Leading speaker arrows (>> Hello) are trimmed
+# afterwards with lstrip, since tag removal/unescaping can expose them.
+# Newlines are excluded so stray brackets cannot swallow whole lines.
+_STRIP_MARKUP_RE = re.compile(r"<[^>\n]+>|\[[^\]\n]*\]")
+# Lines that carry no subtitle text: headers, SRT indices, timecodes, and
+# VTT cue settings / metadata, all folded into one alternation.
+_SKIP_LINE_RE = re.compile(
+    r"^(?:WEBVTT|NOTE|\d+$|(?i:position|align|line|size|region|kind|language):)"
+    r"|-->|X-TIMESTAMP-MAP"
+)
+_VIDEO_ID_RE = re.compile(r"(?:[?&]v=|youtu\.be/)([A-Za-z0-9_-]{11})")
+_INFO_CACHE_DIR = Path.home() / ".cache" / "enrich_note" / "yt"
+_INFO_CACHE_TTL = 24 * 3600  # seconds
+
 _YOUTUBE_COOKIE_SUFFIXES = (
     ".youtube.com",
     ".youtube-nocookie.com",
@@ -29,78 +47,44 @@ _YOUTUBE_COOKIE_SUFFIXES = (
     ".youtube.googleapis.com",
     ".googleusercontent.com",
 )
+# SQL-level prefilter matching the suffixes above; the predicate still runs
+# as a residual check on whatever rows SQLite returns.
+_YOUTUBE_HOST_LIKE = tuple(f"%{suffix.lstrip('.')}" for suffix in _YOUTUBE_COOKIE_SUFFIXES)
+
+
+def _join_subtitle_lines(lines: Iterable[str]) -> str:
+    """Filter cue/metadata lines from already-unescaped, markup-free text and
+    join what remains into a single compact paragraph."""
+    cleaned = (
+        " ".join(line.lstrip("> ").split())
+        for line in (raw_line.strip() for raw_line in lines)
+        if line and not _SKIP_LINE_RE.search(line)
+    )
+    # Some YouTube subtitles repeat the same cue text multiple times; groupby
+    # collapses consecutive duplicates.
+    return " ".join(line for line, _ in groupby(c for c in cleaned if c)).strip()
 
 
 def _strip_subtitle_markup(raw: str) -> str:
     """Remove timestamps, indices, and layout cues from subtitle text.
 
-    Handles common VTT/SRT patterns and returns plain text lines.
+    Handles common VTT/SRT patterns and returns plain text as a single
+    compact paragraph with no line breaks.
+    """
+    # Decode entities and drop markup across the whole buffer in one regex
+    # pass, then filter lines with the single combined skip pattern.
+    return _join_subtitle_lines(_STRIP_MARKUP_RE.sub("", html.unescape(raw)).splitlines())
+
+
+def _strip_subtitle_stream(lines: Iterable[str]) -> str:
+    """Streaming variant of _strip_subtitle_markup for line iterables.
+
+    Markup is stripped per line, so peak memory stays at one cue instead
+    of the whole subtitle file.
     """
-    lines: list[str] = []
-    last_text_line: Optional[str] = None
-    for line in raw.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            continue
-
-        # Skip headers and cue settings.
-        if stripped.startswith("WEBVTT") or stripped.startswith("NOTE"):
-            continue
-        if "X-TIMESTAMP-MAP" in stripped:
-            continue
-
-        # Skip simple metadata lines that sometimes appear in YouTube exports.
-        if stripped.lower().startswith(("kind:", "language:")):
-            continue
-
-        # Skip pure numeric indices (SRT).
-        if stripped.isdigit():
-            continue
-
-        # Skip timecode lines (VTT/SRT).
-        if "-->" in stripped or _TIMECODE_RE.fullmatch(stripped):
-            continue
-
-        # Drop simple VTT cue settings (position, align, line, size, etc.).
-        if any(
-            stripped.lower().startswith(prefix)
-            for prefix in (
-                "position:",
-                "align:",
-                "line:",
-                "size:",
-                "region:",
-            )
-        ):
-            continue
-
-        # Remove simple HTML / VTT tags like <c>, <i>, <b>, <00:00:01.000>.
-        text_only = re.sub(r"<[^>]+>", "", stripped)
-
-        # Remove stage directions like [music], [applause], [clears throat], etc.
-        text_only = re.sub(r"\[[^\]]*\]", "", text_only)
-
-        # Decode HTML entities such as &gt;&gt;.
-        text_only = html.unescape(text_only)
-
-        # Strip speaker / cue arrows (>> Hello).
-        text_only = re.sub(r"^>+\s*", "", text_only)
-
-        # Normalize internal whitespace.
-        text_only = " ".join(text_only.split())
-
-        if text_only:
-            # Some YouTube subtitles repeat the same cue text multiple times;
-            # avoid emitting consecutive duplicate lines.
-            if text_only != last_text_line:
-                lines.append(text_only)
-                last_text_line = text_only
-
-    if not lines:
-        return ""
-
-    # Return a single compact paragraph; no line breaks.
-    return " ".join(lines).strip()
+    return _join_subtitle_lines(
+        _STRIP_MARKUP_RE.sub("", html.unescape(line)) for line in lines if line
+    )
 
 
 def _extract_subtitle_url(info: dict[str, object], lang: str) -> tuple[Optional[str], Optional[str]]:
@@ -138,13 +122,84 @@ def _extract_subtitle_url(info: dict[str, object], lang: str) -> tuple[Optional[
     return None, None
 
 
-def fetch_subtitle_text(
-    video_url: str, lang: str = "en", cookiefile: str | Path | None = None
+def _video_id_from_url(video_url: str) -> Optional[str]:
+    m = _VIDEO_ID_RE.search(video_url)
+    return m.group(1) if m else None
+
+
+def _load_cached_info(video_id: str) -> Optional[dict[str, object]]:
+    """Return cached metadata for the video, or None if missing/stale/invalid."""
+    cache_file = _INFO_CACHE_DIR / f"{video_id}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime > _INFO_CACHE_TTL:
+            return None
+        return json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_info(video_id: str, info: dict[str, object]) -> None:
+    """Cache only the fields resolve_subtitle_url needs; best-effort."""
+    minimal = {
+        "title": info.get("title"),
+        "subtitles": info.get("subtitles"),
+        "automatic_captions": info.get("automatic_captions"),
+    }
+    try:
+        _INFO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (_INFO_CACHE_DIR / f"{video_id}.json").write_text(
+            json.dumps(minimal), encoding="utf-8"
+        )
+    except OSError:
+        pass
+
+
+def build_ydl(lang: str = "en", cookiefile: str | Path | None = None) -> yt_dlp.YoutubeDL:
+    """Return a YoutubeDL configured for subtitle resolution.
+
+    Batch callers should create one instance and pass it to
+    resolve_subtitle_url for every video, amortizing yt-dlp's setup cost
+    (extractor imports, cookie loading, regex compilation).
+    """
+    return yt_dlp.YoutubeDL(_build_ydl_opts(lang, cookiefile))
+
+
+def resolve_subtitle_url(
+    video_url: str,
+    lang: str = "en",
+    cookiefile: str | Path | None = None,
+    ydl: yt_dlp.YoutubeDL | None = None,
 ) -> tuple[str, str]:
-    """Return (title, plain_subtitle_text) for the given YouTube URL.
+    """Return (title, subtitle_url) for the given YouTube URL via yt-dlp.
 
-    Prefers manually uploaded subtitles, with automatic captions as a fallback.
+    Prefers manually uploaded subtitles, with automatic captions as a
+    fallback. Metadata is cached on disk per video so reruns within
+    24 hours skip the yt-dlp network round trip entirely. Pass a shared
+    ``ydl`` (see build_ydl) to avoid per-call YoutubeDL construction.
     """
+    video_id = _video_id_from_url(video_url)
+    info = _load_cached_info(video_id) if video_id else None
+
+    if info is None:
+        if ydl is not None:
+            info = ydl.extract_info(video_url, download=False)
+        else:
+            with build_ydl(lang, cookiefile) as own_ydl:
+                info = own_ydl.extract_info(video_url, download=False)
+        if video_id:
+            _save_cached_info(video_id, info)
+
+    title = str(info.get("title") or "").strip()
+
+    subtitle_url, _ = _extract_subtitle_url(info, lang)
+
+    if not subtitle_url:
+        raise RuntimeError(f"No subtitles found (requested '{lang}' but none were available).")
+
+    return title, subtitle_url
+
+
+def _build_ydl_opts(lang: str, cookiefile: str | Path | None) -> dict[str, object]:
     ydl_opts: dict[str, object] = {
         "skip_download": True,
         "ignore_no_formats_error": True,
@@ -156,20 +211,31 @@ def fetch_subtitle_text(
     }
     if cookiefile:
         ydl_opts["cookiefile"] = str(cookiefile)
+    return ydl_opts
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(video_url, download=False)
 
-    title = str(info.get("title") or "").strip()
+async def download_and_strip(session: aiohttp.ClientSession, subtitle_url: str) -> str:
+    """Download a subtitle file over the shared session and return plain text."""
+    async with session.get(subtitle_url) as resp:
+        resp.raise_for_status()
+        raw = await resp.text()
+    return _strip_subtitle_markup(raw)
 
-    subtitle_url, _ = _extract_subtitle_url(info, lang)
 
-    if not subtitle_url:
-        raise RuntimeError(f"No subtitles found (requested '{lang}' but none were available).")
+def fetch_subtitle_text(
+    video_url: str, lang: str = "en", cookiefile: str | Path | None = None
+) -> tuple[str, str]:
+    """Return (title, plain_subtitle_text) for the given YouTube URL.
+
+    Synchronous convenience wrapper for one-off use; batch callers should
+    resolve URLs and download concurrently via ``download_and_strip``.
+    """
+    title, subtitle_url = resolve_subtitle_url(video_url, lang=lang, cookiefile=cookiefile)
 
-    resp = requests.get(subtitle_url, timeout=30)
-    resp.raise_for_status()
-    text = _strip_subtitle_markup(resp.text)
+    # Stream the body line by line so the whole VTT is never held in memory.
+    with requests.get(subtitle_url, stream=True, timeout=30) as resp:
+        resp.raise_for_status()
+        text = _strip_subtitle_stream(resp.iter_lines(decode_unicode=True))
     return title, text
 
 
@@ -181,7 +247,9 @@ def _youtube_host_predicate(host: str) -> bool:
 @contextmanager
 def youtube_cookiefile_from_firefox(profile: str | None = None) -> Iterator[Path]:
     profile_path = find_firefox_profile(profile)
-    with firefox_cookie_jar(_youtube_host_predicate, profile_path) as cookie_file:
+    with firefox_cookie_jar(
+        _youtube_host_predicate, profile_path, host_like=_YOUTUBE_HOST_LIKE
+    ) as cookie_file:
         yield cookie_file
 
 
@@ -20,7 +20,7 @@ SAME_SITE_MAP: dict[int, SameSiteValue] = {0: "None", 1: "Lax", 2: "Strict"}
 def extract_x_cookies(profile_path) -> list[SetCookieParam]:
     """Load Firefox cookies for x.com/twitter.com and adapt them for Playwright."""
     raw_cookies = load_firefox_cookies(
-        profile_path, lambda host: "x.com" in host or "twitter.com" in host
+        profile_path, host_like=("%x.com%", "%twitter.com%")
     )
     cookies: list[SetCookieParam] = []
     for cookie in raw_cookies:
@@ -38,12 +38,38 @@ def extract_x_cookies(profile_path) -> list[SetCookieParam]:
     return cookies
 
 
+# Polls for the tweet text node and returns its text in one IPC round trip,
+# replacing the wait_for_selector + query_selector_all + inner_text trio.
+# Resolves to null if the node never appears within 15 s.
+_TWEET_TEXT_JS = """
+async () => {
+    const el = await new Promise((resolve) => {
+        const timer = setInterval(() => {
+            const node = document.querySelector('[data-testid="tweetText"]');
+            if (node) { clearInterval(timer); resolve(node); }
+        }, 50);
+        setTimeout(() => { clearInterval(timer); resolve(null); }, 15000);
+    });
+    return el ? el.innerText : null;
+}
+"""
+
+
 def scrape_post(page, url: str) -> str:
     page.goto(url, wait_until="domcontentloaded")
     try:
-        page.wait_for_selector('[data-testid="tweetText"]', timeout=15000)
-        elements = page.query_selector_all('[data-testid="tweetText"]')
-        return elements[0].inner_text() if elements else "(no text found)"
+        text = page.evaluate(_TWEET_TEXT_JS)
+        return text if text else "(timed out or post unavailable)"
+    except Exception:
+        return "(timed out or post unavailable)"
+
+
+async def scrape_post_async(page, url: str) -> str:
+    """Async counterpart of scrape_post for use with playwright.async_api."""
+    await page.goto(url, wait_until="domcontentloaded")
+    try:
+        text = await page.evaluate(_TWEET_TEXT_JS)
+        return text if text else "(timed out or post unavailable)"
     except Exception:
         return "(timed out or post unavailable)"
 